@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for serving the Todo app in production.
+
+Usage:
+     gunicorn main:app
+
+Settings:
+     - One worker process per CPU core, each running a pool of threads
+       (gthread), so requests waiting on SQLite or Redis do not block
+       the rest of the worker.
+     - Password hashing (Argon2id, legacy bcrypt) runs in C with the GIL
+       released, so a thread busy with a login or signup does not stall
+       the other threads of its worker; the views can stay synchronous.
+     - preload_app imports main.py once in the master before forking,
+       so the workers share the loaded code and the tables are created once.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = True
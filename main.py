@@ -1,34 +1,60 @@
-from flask import Flask, request, redirect, render_template, flash, url_for
+from flask import Flask, request, redirect, render_template, flash, url_for, abort, make_response
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import relationship, load_only, raiseload, make_transient_to_detached
+from datetime import datetime, timezone
 from flask_bcrypt import Bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from verification import verify_username, verify_password
 from flask_login import UserMixin, LoginManager, login_required, login_user, logout_user, current_user
+from flask_caching import Cache
+from flask_session import Session
+from jinja2 import FileSystemBytecodeCache
+import redis
+import hashlib
+import hmac
+import os
 import secrets
+import sqlite3
+import tempfile
 
 """
 A Flask-based Todo application with user authentication and SQLite database integration.
 
 Features:
-     - User registration and login with password hashing (bcrypt).
+     - User registration and login with password hashing (Argon2id).
      - User session management using Flask-Login.
      - Add, complete, and delete todo items.
      - Separate storage for active and completed todos.
      - Flash messages for user feedback.
+     - Repeated logins within a minute skip the password hash check.
+     - Per-user caching of the rendered home page (Redis via Flask-Caching).
+     - Server-side sessions stored in Redis (Flask-Session).
+     - Logged-in users are cached in Redis between requests.
 
 Modules:
      - flask: Web framework for Python.
      - flask_sqlalchemy: SQLAlchemy ORM integration for Flask.
-     - flask_bcrypt: Password hashing.
+     - argon2: Password hashing (Argon2id).
+     - flask_bcrypt: Verification of legacy bcrypt password hashes.
      - flask_login: User session management.
+     - flask_caching: Caching of rendered pages.
+     - flask_session: Server-side session storage.
+     - redis: Client for the Redis server backing the cache and sessions.
+     - jinja2: On-disk cache of compiled templates.
      - datetime: For handling date and time.
-     - secrets: For generating secure secret keys.
+     - secrets, tempfile: For generating and storing the secret key.
+     - hmac, hashlib: For remembering recently verified logins.
+     - sqlite3: For tuning SQLite connections.
 
 Database Models:
      User(db.Model, UserMixin):
           - id (int): Primary key.
-          - username (str): Unique username.
+          - username (str): Unique username (unique index).
           - password_hash (str): Hashed password.
 
      Todo(db.Model):
@@ -36,59 +62,174 @@ Database Models:
           - title (str): Title of the todo item (required).
           - description (str): Description of the todo item (required).
           - date_created (date): Date when the todo was created (defaults to current date).
+          - is_completed (bool): Whether the todo item has been completed.
+          - user_id (int): Owner of the todo item (foreign key to User).
+          - Index on (user_id, is_completed, date_created, id) for the home page listing.
 
 Routes:
      '/' [GET]:
-          - Display all active and completed todo items (login required).
+          - Display the user's todo items, one page at a time, active ones first (login required).
+          - Accepts an optional '?page=' query argument.
+          - Sends an ETag; answers 304 Not Modified while the todos are unchanged.
+     '/todos' [GET]:
+          - Same as '/' but renders only the todo lists (login required).
      '/' [POST]:
-          - Add a new todo item (login required).
+          - Add one or more new todo items (login required).
      '/login' [GET, POST]:
           - User login.
      '/signup' [GET, POST]:
           - User registration.
-     '/complete/<int:id>' [GET]:
-          - Mark a todo item as completed (login required).
-     '/delete/<int:id>' [GET]:
-          - Delete an active todo item (login required).
-     '/delete_comp/<int:id>' [GET]:
-          - Delete a completed todo item (login required).
-     '/clear_completed' [GET]:
+     '/complete' [POST]:
+          - Mark the todo items posted as 'ids' as completed (login required).
+     '/delete' [POST]:
+          - Delete the todo items posted as 'ids' (login required).
+     '/clear_completed' [POST]:
           - Delete all completed todo items (login required).
      '/logout' [GET]:
           - Log out the current user.
 
 Application Entry Point:
-     - Creates database tables if they do not exist.
-     - Runs the Flask development server in debug mode.
+     - Creates database tables and indexes if they do not exist (on import).
+     - Runs the Flask development server (debug mode with FLASK_DEBUG=1).
+     - In production, serve with gunicorn instead (settings in gunicorn.conf.py):
+          gunicorn main:app
 """
 
 # Flask app and extension setup
 app = Flask(__name__)
-app.secret_key = secrets.token_hex()  # Secure random secret key for session management
+
+def load_secret_key():
+    """
+    Returns the secret key for session management.
+    Taken from the SECRET_KEY environment variable, or from the instance
+    folder, where a random key is generated on first start. A stable key
+    keeps signed cookies valid across restarts and worker processes.
+    """
+    key = os.environ.get('SECRET_KEY')
+    if key:
+        return key
+    path = os.path.join(app.instance_path, 'secret_key')
+    os.makedirs(app.instance_path, exist_ok=True)
+    if not os.path.exists(path):
+        # Write the key to a private temp file, then publish it with link(),
+        # which never overwrites: the file only ever appears complete, and when
+        # several processes race, all of them read the key that won.
+        fd, tmp_path = tempfile.mkstemp(prefix='.secret_key-', dir=app.instance_path)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(secrets.token_hex(32))
+            os.link(tmp_path, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp_path)
+    with open(path) as f:
+        key = f.read().strip()
+    if not key:
+        raise RuntimeError(f"Secret key file {path} is empty")
+    return key
+
+app.secret_key = load_secret_key()
+
+# Keep compiled templates on disk so each worker skips parsing them. Templates
+# are only checked for changes in debug mode (TEMPLATES_AUTO_RELOAD unset).
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 
 # Flask-Login setup
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = "login"
 
-# Bcrypt for password hashing
+# Argon2id for password hashing (OWASP parameters: m=19 MiB, t=2, p=1)
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Bcrypt only verifies hashes created before the switch to Argon2id
 bcrypt = Bcrypt(app)
 
 # SQLAlchemy database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///todos.db'  # Default (todos) database
-app.config['SQLALCHEMY_BINDS'] = {
-    'users': 'sqlite:///users_db.db'   # Separate users database (not used for FK)
-}
+app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///todos.db'  # Single database for users and todos
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Reuse SQLite connections across requests instead of reconnecting
+# (SQLAlchemy < 2.0 defaults to NullPool for file databases), and keep
+# compiled SQL for every statement the views issue so it is never rebuilt
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'poolclass': QueuePool,
+    'pool_size': 10,
+    'max_overflow': 20,
+    'connect_args': {'check_same_thread': False},
+    'query_cache_size': 1200,
+}
 db = SQLAlchemy(app)
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tunes every new SQLite connection.
+    With the WAL journal (enabled once per database in init_db),
+    synchronous=NORMAL avoids an fsync per commit; temp tables and
+    mmap reads stay in memory.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+    cursor.close()
+
+# Number of todos shown per page on the home view
+TODOS_PER_PAGE = 50
+
+# Redis server shared by the cache and the session store
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+
+# Flask-Caching setup (Redis by default, override CACHE_TYPE e.g. with SimpleCache)
+app.config['CACHE_TYPE'] = os.environ.get('CACHE_TYPE', 'RedisCache')
+app.config['CACHE_REDIS_URL'] = REDIS_URL
+cache = Cache(app)
+
+# Flask-Session setup: the cookie only carries a session id, the data lives
+# in Redis (override SESSION_TYPE e.g. with cachelib)
+app.config['SESSION_TYPE'] = os.environ.get('SESSION_TYPE', 'redis')
+app.config['SESSION_REDIS'] = redis.Redis.from_url(REDIS_URL)
+# Only write a session back to Redis (and resend its cookie) when it changed,
+# instead of on every request; sessions then expire a fixed
+# PERMANENT_SESSION_LIFETIME after they were last modified.
+app.config['SESSION_REFRESH_EACH_REQUEST'] = False
+# Browsers do not send the session cookie with cross-site POSTs, so the
+# state-changing POST routes cannot be triggered from other sites (CSRF)
+app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
+Session(app)
+
+# Seconds a user stays cached for Flask-Login's user loader
+USER_CACHE_TIMEOUT = 300
+
 @login_manager.user_loader
 def load_user(user_id):
     """
     Flask-Login user loader callback.
     Loads a user by their user_id for session management.
+    The id and username are cached, so authenticated requests usually skip
+    the users table; other columns are loaded from the database on access.
+    """
+    key = f"user:{user_id}"
+    data = cache.get(key)
+    if data is None:
+        user = User.get(user_id)
+        if user is not None:
+            cache.set(key, {'id': user.id, 'username': user.username},
+                      timeout=USER_CACHE_TIMEOUT)
+        return user
+    user = User(**data)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+def utc_today():
     """
-    return User.get(user_id)
+    Returns the current date in UTC.
+    Default for Todo.date_created, evaluated on every insert.
+    """
+    return datetime.now(timezone.utc).date()
 
 class User(db.Model, UserMixin):
     """
@@ -97,11 +238,12 @@ class User(db.Model, UserMixin):
     """
     __tablename__ = 'users_table'
     id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(30), nullable=False)
+    username = db.Column(db.String(30), nullable=False, unique=True, index=True)
     password_hash = db.Column(db.String(), nullable=False)
 
-    # Relationship to Todo items (one-to-many)
-    todos = relationship('Todo', back_populates='user', lazy='dynamic')
+    # Relationship to Todo items (one-to-many). Loaded lazily on first access
+    # only; views query Todo by user_id instead of going through it.
+    todos = relationship('Todo', back_populates='user')
 
     @staticmethod
     def get(user_id):
@@ -120,10 +262,15 @@ class Todo(db.Model):
     Each todo is linked to a user via a foreign key.
     """
     __tablename__ = 'todo'
+    __table_args__ = (
+        # Serves the home page listing (filter and sort) without a table scan or sort step
+        db.Index('ix_todo_user_listing', 'user_id', 'is_completed',
+                 db.text('date_created DESC'), db.text('id DESC')),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    date_created = db.Column(db.Date, default=datetime.utcnow().date)
+    date_created = db.Column(db.Date, default=utc_today)
     is_completed = db.Column(db.Boolean, default=False)
 
     # Foreign key to User table
@@ -135,17 +282,180 @@ class Todo(db.Model):
     def __repr__(self):
         return f"<Todo {self.id} - {self.title}>"
 
+def create_missing_indexes():
+    """
+    Creates the indexes declared on the models that are missing in the database.
+    db.create_all() only creates indexes together with new tables.
+    Returns True if any index was created.
+    """
+    inspector = db.inspect(db.engine)
+    created = False
+    for table in db.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+                created = True
+    return created
+
+# Recently verified logins are cached per user as a digest keyed with the
+# secret key over the stored password hash and the password
+VERIFIED_LOGIN_TTL = 60  # seconds
+
+def login_digest(user, password):
+    """
+    Returns the keyed SHA-256 digest remembered for a verified login.
+    The stored hash is part of the message, so a password change makes
+    any remembered digest stale.
+    """
+    stored_hash = user.password_hash
+    if isinstance(stored_hash, bytes):
+        stored_hash = stored_hash.decode()
+    message = f"{stored_hash}\0{password}".encode()
+    return hmac.new(app.config['SECRET_KEY'].encode(), message, hashlib.sha256).hexdigest()
+
+def check_password(user, password):
+    """
+    Checks a login password against the user's stored hash.
+    Legacy bcrypt hashes and Argon2 hashes with outdated parameters are
+    replaced by a new Argon2id hash once the password has been verified.
+    A successful check is remembered in the cache for VERIFIED_LOGIN_TTL
+    seconds as a keyed digest, so repeated logins skip the hashing work.
+    """
+    cache_key = f"verified_login:{user.id}"
+    cached = cache.get(cache_key)
+    if cached and hmac.compare_digest(cached, login_digest(user, password)):
+        return True
+
+    stored_hash = user.password_hash
+    if isinstance(stored_hash, bytes):  # bcrypt hashes were stored as bytes
+        stored_hash = stored_hash.decode()
+    if stored_hash.startswith('$2'):
+        # bcrypt rejects (raises on) passwords longer than 72 bytes, and no
+        # such password can match a bcrypt hash
+        if len(password.encode()) > 72:
+            return False
+        if not bcrypt.check_password_hash(stored_hash, password):
+            return False
+        needs_rehash = True
+    else:
+        try:
+            password_hasher.verify(stored_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+        needs_rehash = password_hasher.check_needs_rehash(stored_hash)
+    if needs_rehash:
+        user.password_hash = password_hasher.hash(password)
+        db.session.commit()
+
+    cache.set(cache_key, login_digest(user, password), timeout=VERIFIED_LOGIN_TTL)
+    return True
+
+def todos_version(user_id):
+    """
+    Returns the cache version of a user's todo lists.
+    A new version is generated once the previous one has been invalidated.
+    """
+    key = f"todos_version:{user_id}"
+    version = cache.get(key)
+    if version is None:
+        version = secrets.token_hex(8)
+        cache.set(key, version, timeout=0)
+    return version
+
+def invalidate_todos(user_id):
+    """
+    Invalidates the cached home page of a user.
+    Must be called by every route that modifies the user's todos.
+    """
+    cache.delete(f"todos_version:{user_id}")
+
+def add_todos(user_id, items):
+    """
+    Adds todo items for a user from (title, description) pairs.
+    All rows are sent in one executemany INSERT, bypassing the ORM unit of work,
+    and committed together.
+    """
+    rows = [
+        {'title': title, 'description': desc, 'user_id': user_id, 'is_completed': False}
+        for title, desc in items
+    ]
+    db.session.execute(db.insert(Todo), rows)
+    db.session.commit()
+    invalidate_todos(user_id)
+
+def render_todos(template, user_id, page):
+    """
+    Renders one page of a user's todos, active ones first, with the given template.
+    Both lists come from a single query; only the displayed columns are loaded.
+    Any other attribute or relationship access raises instead of silently
+    emitting one extra SELECT per todo.
+    """
+    stmt = (
+        db.select(Todo)
+        .where(Todo.user_id == user_id)
+        .options(load_only(Todo.id, Todo.title, Todo.description,
+                           Todo.date_created, Todo.is_completed, raiseload=True),
+                 raiseload('*'))
+        .order_by(Todo.is_completed, Todo.date_created.desc(), Todo.id.desc())
+    )
+    pagination = db.paginate(stmt, page=page, per_page=TODOS_PER_PAGE, error_out=False)
+    todos = [todo for todo in pagination.items if not todo.is_completed]
+    completed = [todo for todo in pagination.items if todo.is_completed]
+
+    # Completed todos are numbered within their own list. They start at 1 on
+    # the page where the active list ends; on later pages the active todos
+    # shown on earlier pages have to be skipped.
+    completed_offset = 0
+    if completed and not todos:
+        active_count = db.session.scalar(
+            db.select(db.func.count())
+            .select_from(Todo)
+            .where(Todo.user_id == user_id, Todo.is_completed == False)
+        )
+        completed_offset = pagination.first - 1 - active_count
+    return render_template(template, todos=todos, completed=completed,
+                           completed_offset=completed_offset, pagination=pagination)
+
+def todos_response(template):
+    """
+    Builds the response for a page of the current user's todos.
+    The rendered page is cached per todo version and tagged with a matching
+    ETag, so a client revalidating an unchanged page gets 304 Not Modified
+    without touching the database or the template.
+    """
+    page = request.args.get('page', 1, type=int)
+    etag = f"{current_user.id}-{todos_version(current_user.id)}-{page}"
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+    else:
+        key = f"{template}:{etag}"
+        body = cache.get(key)
+        if body is None:
+            body = render_todos(template, current_user.id, page)
+            cache.set(key, body, timeout=300)
+        response = make_response(body)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/')
 @login_required
 def hello():
     """
     Home route.
-    Displays all active and completed todos for the logged-in user.
+    Displays one page of the logged-in user's todos.
+    """
+    return todos_response('home.html')
+
+@app.route('/todos')
+@login_required
+def todos_fragment():
+    """
+    Renders only the todo lists of the home page, without the page shell.
+    Lets clients refresh the lists without downloading the whole page.
     """
-    user = User.query.filter_by(username=current_user.username).first()
-    todos = user.todos.filter_by(is_completed=False).all()
-    completed = user.todos.filter_by(is_completed=True).all()
-    return render_template('home.html', todos=todos, completed=completed)
+    return todos_response('todos_fragment.html')
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -157,11 +467,13 @@ def login():
         username = request.form['username']
         password = request.form['password']
 
-        user = User.query.filter_by(username=username).first()
+        user = db.session.execute(
+            db.select(User).where(User.username == username)
+        ).scalar_one_or_none()
         if not user:
             flash('Invalid User.', 'error')
         else:
-            password_correct = bcrypt.check_password_hash(user.password_hash, password)
+            password_correct = check_password(user, password)
             if not password_correct:
                 flash('Invalid Password.', 'error')
             else:
@@ -176,30 +488,32 @@ def signup():
     """
     Signup route.
     Handles user registration via POST and renders signup form via GET.
-    Validates username and password, checks for duplicates, and creates a new user.
+    Validates username and password and creates a new user.
+    Duplicates are detected by the unique index on username when inserting.
     """
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
         confirm_password = request.form['confirm_password']
 
-        user = User.query.filter_by(username=username).first()
-
-        if user:
-            flash('User already exists.', 'error')
-        elif not verify_username(username):
+        if not verify_username(username):
             flash('Invalid username.', 'error')
         elif not verify_password(password):
             flash('Invalid password.', 'error')
         elif password != confirm_password:
             flash('Passwords do not match.', 'error')
         else:
-            password_hash = bcrypt.generate_password_hash(password)
+            password_hash = password_hasher.hash(password)
             user = User(username=username, password_hash=password_hash)
             db.session.add(user)
-            db.session.commit()
-            flash('User added successfully.', 'success')
-            return redirect(url_for('login'))
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                flash('User already exists.', 'error')
+            else:
+                flash('User added successfully.', 'success')
+                return redirect(url_for('login'))
 
     return render_template('signup.html')
 
@@ -207,67 +521,80 @@ def signup():
 @login_required
 def handle_submit():
     """
-    Handles submission of a new todo item.
+    Handles submission of one or more new todo items.
+    Repeated 'title'/'description' fields are added together (see add_todos).
     Requires user to be logged in.
     """
     try:
-        title = request.form['title']
-        desc = request.form['description']
-        if not title or not desc:
+        titles = request.form.getlist('title')
+        descs = request.form.getlist('description')
+        if not titles or len(titles) != len(descs) or not all(titles) or not all(descs):
             return "Title and description are required.", 400
-        
-        user = User.query.filter_by(username=current_user.username).first()
-        todo = Todo(title=title, description=desc, user=user)
-        db.session.add(todo)
-        db.session.commit()
+
+        add_todos(current_user.id, zip(titles, descs))
         flash('Added successfully')
         return redirect('/')
     except Exception as e:
         db.session.rollback()
         return f"An error occurred: {str(e)}", 500
 
-@app.route('/complete/<int:id>')
-@login_required
-def handle_complete(id):
+def posted_todo_ids():
     """
-    Marks a todo item as completed.
+    Returns the todo ids posted in the repeated 'ids' form field.
+    Aborts with 400 if no valid id was posted.
     """
-    todo = db.get_or_404(Todo, id)
-    todo.is_completed = True
-    db.session.commit()
-    return redirect('/')
+    ids = request.form.getlist('ids', type=int)
+    if not ids:
+        abort(400)
+    return ids
 
-@app.route('/delete/<int:id>')
+@app.route('/complete', methods=['POST'])
 @login_required
-def handle_delete(id):
+def handle_complete():
     """
-    Deletes an active todo item.
+    Marks the posted todo items of the current user as completed.
+    All items are updated by a single UPDATE and one commit.
     """
-    todo = db.get_or_404(Todo, id)
-    db.session.delete(todo)
+    stmt = (
+        db.update(Todo)
+        .where(Todo.id.in_(posted_todo_ids()), Todo.user_id == current_user.id)
+        .values(is_completed=True)
+    )
+    result = db.session.execute(stmt, execution_options={'synchronize_session': False})
     db.session.commit()
+    if result.rowcount == 0:
+        abort(404)
+    invalidate_todos(current_user.id)
     return redirect('/')
 
-@app.route('/delete_comp/<int:id>')
+@app.route('/delete', methods=['POST'])
 @login_required
-def handle_delete_comp(id):
+def handle_delete():
     """
-    Deletes a completed todo item.
+    Deletes the posted todo items (active or completed) of the current user.
+    All items are removed by a single DELETE and one commit.
     """
-    todo = db.get_or_404(Todo, id)
-    db.session.delete(todo)
+    stmt = db.delete(Todo).where(Todo.id.in_(posted_todo_ids()),
+                                 Todo.user_id == current_user.id)
+    result = db.session.execute(stmt, execution_options={'synchronize_session': False})
     db.session.commit()
+    if result.rowcount == 0:
+        abort(404)
+    invalidate_todos(current_user.id)
     return redirect('/')
 
-@app.route('/clear_completed')
+@app.route('/clear_completed', methods=['POST'])
 @login_required
 def handle_clear_completed():
     """
     Deletes all completed todo items for the current user.
+    The session is not synchronized, so no rows are evaluated in Python.
     """
-    delete_stmt = db.delete(Todo).filter_by(is_completed=True)
-    db.session.execute(delete_stmt)
+    delete_stmt = db.delete(Todo).where(Todo.user_id == current_user.id,
+                                        Todo.is_completed == True)
+    db.session.execute(delete_stmt, execution_options={'synchronize_session': False})
     db.session.commit()
+    invalidate_todos(current_user.id)
     return redirect('/')
 
 @app.route('/logout')
@@ -280,9 +607,30 @@ def handle_logout():
     flash('Logout successfull.', 'success')
     return redirect('/login')
 
-if __name__ == '__main__':
-    # Create all tables for the app (users and todos)
+def init_db():
+    """
+    Creates all tables (users and todos) and missing indexes, switches the
+    databases to the WAL journal so readers never block writers (the mode is
+    stored in the database file). When indexes were added to existing
+    tables, ANALYZE gathers the statistics the query planner uses for them.
+    The pooled connections are closed afterwards so that forked server
+    workers do not share SQLite connections with the parent process.
+    """
     with app.app_context():
-        db.create_all(bind_key='users')  # Create users table if using bind
-        db.create_all()                  # Create all other tables
-    app.run(debug=True)
\ No newline at end of file
+        db.create_all()                  # Create the users and todo tables
+        indexes_created = create_missing_indexes()  # Add new indexes to existing tables
+        for engine in db.engines.values():
+            with engine.connect() as connection:
+                connection.exec_driver_sql('PRAGMA journal_mode=WAL')
+                if indexes_created:
+                    connection.exec_driver_sql('ANALYZE')
+                    connection.commit()
+            engine.dispose()
+
+# Run at import time so that WSGI servers (see gunicorn.conf.py) get the tables too
+init_db()
+
+if __name__ == '__main__':
+    # Development server only, use gunicorn in production. The debugger and
+    # reloader (and template auto-reload) are opt-in with FLASK_DEBUG=1.
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -1,4 +1,20 @@
-import re
+import string
+
+# Characters allowed in a username. Checking membership in a set is a single
+# C-level pass over the string, with no regex matcher to set up.
+_USERNAME_CHARS = frozenset(string.ascii_letters + string.digits + '_.')
+
+# Character classes a password must contain, as bit flags
+_HAS_UPPER = 1
+_HAS_LOWER = 2
+_HAS_DIGIT = 4
+_HAS_SPECIAL = 8
+_HAS_ALL = _HAS_UPPER | _HAS_LOWER | _HAS_DIGIT | _HAS_SPECIAL
+_SPECIALS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+# Upper bound on password length, so a huge form value cannot make signup
+# hash arbitrarily large input (Argon2id has no length limit of its own)
+_MAX_PASSWORD_BYTES = 1024
 
 def verify_username(username: str) -> bool:
     """
@@ -11,14 +27,15 @@ def verify_username(username: str) -> bool:
         return False
     if not (3 <= len(username) <= 20):
         return False
-    if not re.match(r'^[A-Za-z][A-Za-z0-9_.]*$', username):
+    first = username[0]
+    if not ('A' <= first <= 'Z' or 'a' <= first <= 'z'):
         return False
-    return True
+    return _USERNAME_CHARS.issuperset(username)
 
 def verify_password(password: str) -> bool:
     """
     Verifies that the password:
-    - Is at least 8 characters
+    - Is at least 8 characters and at most 1024 bytes (UTF-8)
     - Contains at least one uppercase letter
     - Contains at least one lowercase letter
     - Contains at least one digit
@@ -26,15 +43,21 @@ def verify_password(password: str) -> bool:
     """
     if not isinstance(password, str):
         return False
-    if len(password) < 8:
-        return False
-    if not re.search(r'[A-Z]', password):
-        return False
-    if not re.search(r'[a-z]', password):
-        return False
-    if not re.search(r'\d', password):
-        return False
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        return False
-    return True
-
+    if len(password) < 8 or len(password.encode('utf-8')) > _MAX_PASSWORD_BYTES:
+        return False
+    # Single pass over the password, stopping once every class has been seen
+    flags = 0
+    for ch in password:
+        if 'A' <= ch <= 'Z':
+            flags |= _HAS_UPPER
+        elif 'a' <= ch <= 'z':
+            flags |= _HAS_LOWER
+        elif ch.isdecimal():  # same characters as \d
+            flags |= _HAS_DIGIT
+        elif ch in _SPECIALS:
+            flags |= _HAS_SPECIAL
+        else:
+            continue
+        if flags == _HAS_ALL:
+            return True
+    return False